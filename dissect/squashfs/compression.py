@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import importlib
+import threading
 
 from dissect.squashfs.c_squashfs import c_squashfs
 
@@ -47,7 +48,8 @@ class NativeZlib(Compression):
     module = "zlib"
 
     def decompress(self, data: bytes, expected: int) -> bytes:
-        return self._module.decompress(data)
+        # Sizing the output buffer upfront avoids repeated buffer growth
+        return self._module.decompress(data, bufsize=expected)
 
 
 class NativeLZMA(Compression):
@@ -83,5 +85,17 @@ class AvailableLZ4(Compression):
 class NativeZSTD(Compression):
     module = "zstandard"
 
+    def __init__(self):
+        super().__init__()
+        # Decompressor contexts are reusable but not thread-safe, so keep one per thread
+        # instead of creating a fresh context for every block
+        self._local = threading.local()
+
     def decompress(self, data: bytes, expected: int) -> bytes:
-        return self._module.decompress(data)
+        try:
+            dctx = self._local.dctx
+        except AttributeError:
+            dctx = self._local.dctx = self._module.ZstdDecompressor()
+        # Blocks never exceed the filesystem block size, so the output buffer can
+        # be sized exactly when the frame doesn't embed its content size
+        return dctx.decompress(data, max_output_size=expected)
@@ -4,11 +4,16 @@
 
 from __future__ import annotations
 
+import io
+import mmap
 import stat
 import struct
 from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import cache, cached_property, lru_cache
-from typing import TYPE_CHECKING, BinaryIO
+from itertools import accumulate
+from typing import TYPE_CHECKING, BinaryIO, NamedTuple
 
 from dissect.util import ts
 from dissect.util.stream import RunlistStream
@@ -26,11 +31,60 @@ if TYPE_CHECKING:
     from collections.abc import Iterator
     from datetime import datetime
 
+# Maximum amount of decompressed block data to keep cached per filesystem
+DEFAULT_CACHE_SIZE = 128 * 1024 * 1024
+
+# The metadata size is a power of two, so positions can be split into a block
+# index and offset with a shift and mask instead of a divmod
+_METADATA_SHIFT = c_squashfs.SQUASHFS_METADATA_SIZE.bit_length() - 1
+_METADATA_MASK = c_squashfs.SQUASHFS_METADATA_SIZE - 1
+assert c_squashfs.SQUASHFS_METADATA_SIZE == 1 << _METADATA_SHIFT
+
+_uint16 = struct.Struct("<H")
+_uint32 = struct.Struct("<I")
+_uint64 = struct.Struct("<Q")
+
+# Hand-rolled parsers for the structures hit on every directory walk and fragment
+# lookup; going through cstruct here is measurably slower. cstruct remains in use
+# for the cold paths (superblock, full inode headers, compression options).
+_dir_header = struct.Struct("<III")  # squashfs_dir_header
+_dir_entry = struct.Struct("<HhHH")  # squashfs_dir_entry
+_fragment_entry = struct.Struct("<qII")  # squashfs_fragment_entry
+
+
+class FragmentEntry(NamedTuple):
+    start_block: int
+    size: int
+    unused: int
+
+
+@lru_cache(1024)
+def _uint32_array(count: int) -> struct.Struct:
+    return struct.Struct(f"<{count}I")
+
 
 class SquashFS:
-    def __init__(self, fh: BinaryIO):
+    def __init__(self, fh: BinaryIO, workers: int | None = None):
+        # Raw unbuffered streams would pay a syscall for every small metadata read,
+        # like the 2-byte block length headers; give them a sizable read buffer
+        if isinstance(fh, io.RawIOBase):
+            fh = io.BufferedReader(fh, buffer_size=256 * 1024)
+
         self.fh = fh
 
+        # Decompression of independent blocks can optionally be fanned out over a
+        # thread pool (the zlib, lzma and zstandard modules release the GIL)
+        self._pool = ThreadPoolExecutor(max_workers=workers) if workers else None
+
+        # Memory-map regular files so block reads become zero-copy slices instead of
+        # seek and read syscall pairs; any other stream falls back to regular reads
+        self._view = None
+        if isinstance(fh, io.FileIO) or (isinstance(fh, io.BufferedReader) and isinstance(fh.raw, io.FileIO)):
+            try:
+                self._view = memoryview(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+            except (OSError, ValueError):
+                self._view = None
+
         sb = c_squashfs.squashfs_super_block(fh)
         if sb.s_magic != c_squashfs.SQUASHFS_MAGIC:
             raise ValueError("Invalid squashfs superblock")
@@ -48,7 +102,12 @@ class SquashFS:
         self.minor = self.sb.s_minor
         self.size = self.sb.bytes_used
 
-        self._read_block = lru_cache(1024)(self._read_block)
+        # Cache decompressed blocks by a byte budget rather than entry count, so large
+        # data blocks don't blow up memory and small metadata blocks aren't evicted early
+        self._block_cache: OrderedDict[tuple[int, int | None], tuple[int, bytes]] = OrderedDict()
+        self._block_cache_bytes = 0
+
+        self._resolve = lru_cache(4096)(self._resolve)
         self._lookup_id = lru_cache(1024)(self._lookup_id)
         self._lookup_inode = lru_cache(1024)(self._lookup_inode)
         self._lookup_fragment = lru_cache(1024)(self._lookup_fragment)
@@ -58,12 +117,13 @@ class SquashFS:
             self._compression_options = self._read_block(len(self.sb))[1]
 
         self._compression = compression.initialize(self.sb.compression, self._compression_options)
+        # Bind the concrete decompress callable once, the algorithm is fixed for
+        # the lifetime of this filesystem
+        self._decompress = self._compression.decompress if self._compression is not None else None
 
         self.id_table = self._read_table(self.sb.id_table_start, self.sb.no_ids, 4)
         self.lookup_table = self._read_table(self.sb.lookup_table_start, self.sb.inodes, 8)
-        self.fragment_table = self._read_table(
-            self.sb.fragment_table_start, self.sb.fragments, len(c_squashfs.squashfs_fragment_entry)
-        )
+        self.fragment_table = self._read_table(self.sb.fragment_table_start, self.sb.fragments, _fragment_entry.size)
 
         self.root = self.inode(self.sb.root_inode >> 16, self.sb.root_inode & 0xFFFF, name="/")
 
@@ -71,7 +131,7 @@ class SquashFS:
         self,
         block: int,
         offset: int,
-        name: str | None = None,
+        name: str | bytes | None = None,
         type: int | None = None,
         inode_number: int | None = None,
         parent: INode | None = None,
@@ -83,8 +143,15 @@ class SquashFS:
         if isinstance(path, int):
             return self.inode(path >> 16, path & 0xFFFF)
 
-        node = node or self.root
+        if node is None:
+            # The filesystem is read-only, so absolute lookups can be cached forever
+            return self._resolve(path)
+        return self._walk(path, node)
 
+    def _resolve(self, path: str) -> INode:
+        return self._walk(path, self.root)
+
+    def _walk(self, path: str, node: INode) -> INode:
         parts = path.split("/")
 
         for part_num, part in enumerate(parts):
@@ -101,67 +168,103 @@ class SquashFS:
             while node.is_symlink() and part_num < len(parts):
                 node = node.link_inode
 
-            for entry in node.iterdir():
-                if entry.name == part:
-                    node = entry
-                    break
-            else:
+            if (entry := node._dirents.get(part.encode(errors="surrogateescape"))) is None:
                 raise FileNotFoundError(f"File not found: {path}")
+            block, entry_offset, entry_type, inode_number = entry
+            node = self.inode(block, entry_offset, part, entry_type, inode_number, parent=node)
 
         return node
 
-    def _read_table(self, offset: int, count: int, entry_size: int) -> list[int]:
+    def _read_table(self, offset: int, count: int, entry_size: int) -> tuple[int, ...]:
         if not count or offset == c_squashfs.SQUASHFS_INVALID_BLK:
-            return []
+            return ()
 
         num_bytes = count * entry_size
         num_blocks = (num_bytes + c_squashfs.SQUASHFS_METADATA_SIZE - 1) // c_squashfs.SQUASHFS_METADATA_SIZE
 
+        return struct.unpack(f"<{num_blocks}Q", self._read_raw(offset, num_blocks * 8))
+
+    def _read_raw(self, offset: int, length: int) -> bytes | memoryview:
+        if self._view is not None:
+            return self._view[offset : offset + length]
+
         self.fh.seek(offset)
-        return c_squashfs.uint64[num_blocks](self.fh)
+        return self.fh.read(length)
 
     def _read_metadata(self, block: int, offset: int, length: int) -> tuple[int, int, bytes]:
-        result = []
-        while length:
+        next_block, data = self._read_block(block)
+        remaining = len(data) - offset
+
+        # Fast path: most reads (inode headers, directory entries, table lookups)
+        # fit entirely within a single metadata block
+        if length < remaining:
+            return block, offset + length, data[offset : offset + length]
+        if length == remaining:
+            return next_block, 0, data[offset:]
+
+        # The target length is known, so write straight into a preallocated buffer
+        # instead of collecting chunks and joining
+        out = bytearray(length)
+        out[:remaining] = data[offset:]
+        pos = remaining
+        block = next_block
+        offset = 0
+
+        while pos < len(out):
             next_block, data = self._read_block(block)
-            remaining = len(data) - offset
+            take = len(out) - pos
 
-            if remaining <= length:
-                result.append(data[offset:])
-                length -= remaining
+            if len(data) <= take:
+                out[pos : pos + len(data)] = data
+                pos += len(data)
                 block = next_block
-                offset = 0
             else:
-                result.append(data[offset : offset + length])
-                offset += length
+                out[pos:] = data[:take]
+                offset = take
                 break
 
-        return block, offset, b"".join(result)
+        return block, offset, bytes(out)
 
     def _read_block(self, block: int, length: int | None = None) -> tuple[int, bytes]:
-        if length is not None:
-            # Data block
-            compressed = length & c_squashfs.SQUASHFS_COMPRESSED_BIT_BLOCK == 0
-            length = length & ~c_squashfs.SQUASHFS_COMPRESSED_BIT_BLOCK
-        else:
+        key = (block, length)
+        if (result := self._block_cache.get(key)) is not None:
+            self._block_cache.move_to_end(key)
+            return result
+
+        if metadata := length is None:
             # Metadata block
-            self.fh.seek(block)
-            length = c_squashfs.uint16(self.fh)
+            length = _uint16.unpack_from(self._read_raw(block, 2))[0]
 
             compressed = length & c_squashfs.SQUASHFS_COMPRESSED_BIT == 0
             length = length & ~c_squashfs.SQUASHFS_COMPRESSED_BIT
             block += 2
+        else:
+            # Data block
+            compressed = length & c_squashfs.SQUASHFS_COMPRESSED_BIT_BLOCK == 0
+            length = length & ~c_squashfs.SQUASHFS_COMPRESSED_BIT_BLOCK
+
+        data = self._read_raw(block, length)
+
+        if compressed:
+            if self._decompress is None:
+                raise RuntimeError(f"Tried to read compressed block {block} but no compression initialized")
 
-        self.fh.seek(block)
-        data = self.fh.read(length)
+            data = self._decompress(data, self.block_size)
+        elif metadata:
+            # Metadata consumers slice, join and decode, so hand them real bytes
+            data = bytes(data)
 
-        if not compressed:
-            return block + length, data
+        result = (block + length, data)
+        self._cache_block(key, result)
+        return result
 
-        if self._compression is None:
-            raise RuntimeError(f"Tried to read compressed block {block} but no compression initialized")
+    def _cache_block(self, key: tuple[int, int | None], result: tuple[int, bytes]) -> None:
+        self._block_cache[key] = result
+        self._block_cache_bytes += len(result[1])
 
-        return block + length, self._compression.decompress(data, self.block_size)
+        while self._block_cache_bytes > DEFAULT_CACHE_SIZE and self._block_cache:
+            _, (_, evicted) = self._block_cache.popitem(last=False)
+            self._block_cache_bytes -= len(evicted)
 
     def _read_fragment(self, fragment: int, offset: int, length: int) -> bytes:
         entry = self._lookup_fragment(fragment)
@@ -169,36 +272,58 @@ class SquashFS:
         return data[offset : offset + length]
 
     def _lookup_id(self, id: int) -> int:
-        block, offset = divmod(id * 4, c_squashfs.SQUASHFS_METADATA_SIZE)
+        pos = id * 4
+        block, offset = pos >> _METADATA_SHIFT, pos & _METADATA_MASK
         _, _, data = self._read_metadata(self.id_table[block], offset, 4)
-        return struct.unpack("<I", data)[0]
+        return _uint32.unpack_from(data)[0]
 
     def _lookup_inode(self, inode_number: int) -> INode:
         if inode_number <= 0 or inode_number > self.sb.inodes:
             raise IndexError(f"inode number out of bounds (1, {self.sb.inodes}): {inode_number}")
-        block, offset = divmod((inode_number - 1) * 8, c_squashfs.SQUASHFS_METADATA_SIZE)
+        pos = (inode_number - 1) * 8
+        block, offset = pos >> _METADATA_SHIFT, pos & _METADATA_MASK
         _, _, data = self._read_metadata(self.lookup_table[block], offset, 8)
-        return self.get(struct.unpack("<Q", data)[0])
+        return self.get(_uint64.unpack_from(data)[0])
 
-    def _lookup_fragment(self, fragment: int) -> c_squashfs.squashfs_fragment_entry:
-        fragment_offset = fragment * len(c_squashfs.squashfs_fragment_entry)
-        block, offset = divmod(fragment_offset, c_squashfs.SQUASHFS_METADATA_SIZE)
+    def _lookup_fragment(self, fragment: int) -> FragmentEntry:
+        fragment_offset = fragment * _fragment_entry.size
+        block, offset = fragment_offset >> _METADATA_SHIFT, fragment_offset & _METADATA_MASK
 
-        _, _, data = self._read_metadata(self.fragment_table[block], offset, len(c_squashfs.squashfs_fragment_entry))
-        return c_squashfs.squashfs_fragment_entry(data)
+        _, _, data = self._read_metadata(self.fragment_table[block], offset, _fragment_entry.size)
+        return FragmentEntry(*_fragment_entry.unpack(data))
 
     def iter_inodes(self) -> Iterator[INode]:
-        for inum in range(1, self.sb.inodes + 1):
-            yield self._lookup_inode(inum)
+        if not self.lookup_table:
+            for inum in range(1, self.sb.inodes + 1):
+                yield self._lookup_inode(inum)
+            return
+
+        # A full scan touches every entry anyway, so read each lookup table block
+        # once and decode all its references in a single unpack instead of going
+        # through _lookup_inode per inode
+        entries_per_block = c_squashfs.SQUASHFS_METADATA_SIZE // 8
+        remaining = self.sb.inodes
+
+        for block in self.lookup_table:
+            count = min(entries_per_block, remaining)
+            remaining -= count
+
+            _, _, data = self._read_metadata(block, 0, count * 8)
+            for ref in struct.unpack(f"<{count}Q", data):
+                yield self.get(ref)
 
 
 class INode:
+    # Keep __dict__ for the cached properties; the fixed attributes still get
+    # faster access and a smaller footprint when walking large trees
+    __slots__ = ("__dict__", "_inode_number", "_name", "_type", "block", "fs", "offset", "parent")
+
     def __init__(
         self,
         fs: SquashFS,
         block: int,
         offset: int,
-        name: str | None = None,
+        name: str | bytes | None = None,
         type: int | None = None,
         inode_number: int | None = None,
         parent: INode | None = None,
@@ -206,7 +331,7 @@ class INode:
         self.fs = fs
         self.block = block
         self.offset = offset
-        self.name = name
+        self._name = name
         self._type = type
         self._inode_number = inode_number
         self.parent = parent
@@ -216,6 +341,13 @@ class INode:
     def __repr__(self) -> str:
         return f"<inode {self.inode_number} ({self.block}, {self.offset})>"
 
+    @cached_property
+    def name(self) -> str | None:
+        # Directory entry names are kept as raw bytes and only decoded on access
+        if isinstance(self._name, bytes):
+            return self._name.decode(errors="surrogateescape")
+        return self._name
+
     def _metadata(
         self,
     ) -> tuple[
@@ -236,14 +368,16 @@ class INode:
         block = self.fs.sb.inode_table_start + self.block
         data_block, data_offset, data = self.fs._read_metadata(block, self.offset, len(base_struct))
 
-        header = base_struct(data)
-        actual_struct = INODE_STRUCT_MAP.get(header.inode_type)
+        # Only the inode type is needed to select the actual header structure
+        actual_struct = INODE_STRUCT_MAP.get(_uint16.unpack_from(data)[0])
 
-        if len(actual_struct) != len(base_struct):
-            data_block, data_offset, data = self.fs._read_metadata(block, self.offset, len(actual_struct))
+        # Read only the remainder of the actual header instead of re-reading from
+        # the start, halving the metadata reads per inode
+        if (delta := len(actual_struct) - len(base_struct)) > 0:
+            data_block, data_offset, extra = self.fs._read_metadata(data_block, data_offset, delta)
+            data += extra
 
-        if actual_struct != base_struct:
-            header = actual_struct(data)
+        header = actual_struct(data)
 
         self.header = header
         self.data_block = data_block
@@ -282,7 +416,7 @@ class INode:
     def inode_number(self) -> int:
         return self._inode_number or self.header.inode_number
 
-    @property
+    @cached_property
     def type(self) -> int:
         return TYPE_MAP[self._type or self.header.inode_type]
 
@@ -359,42 +493,58 @@ class INode:
         relnode = None if link.startswith("/") else self.parent
         return self.fs.get(self.link, relnode)
 
-    def listdir(self) -> dict[str, INode]:
-        return {inode.name: inode for inode in self.iterdir()}
+    @cached_property
+    def _dirents(self) -> dict[bytes, tuple[int, int, int, int]]:
+        """All directory entries as ``raw name -> (block, offset, type, inode_number)``.
 
-    def iterdir(self) -> Iterator[INode]:
+        Parsed once per inode so that :meth:`iterdir`, :meth:`listdir` and repeated
+        path lookups all share the same decoded directory table. Names are kept as
+        raw bytes so lookups don't pay for decoding entries they never touch.
+        """
         if not self.is_dir():
             raise NotADirectoryError(f"{self!r} is not a directory")
 
+        entries = {}
         if self.size == 3:
-            return
+            return entries
 
+        # Read the entire directory table region in one go and parse from a single
+        # buffer, instead of issuing three metadata reads per entry
         start = self.fs.sb.directory_table_start + self.header.start_block
-        offset = self.header.offset
-
-        bytes_read = 0
-        while bytes_read < self.size - 3:
-            start, offset, data = self.fs._read_metadata(start, offset, len(c_squashfs.squashfs_dir_header))
-            dir_header = c_squashfs.squashfs_dir_header(data)
-            bytes_read += len(data)
-
-            for _ in range(dir_header.count + 1):
-                start, offset, data = self.fs._read_metadata(start, offset, len(c_squashfs.squashfs_dir_entry))
-                dir_entry = c_squashfs.squashfs_dir_entry(data)
-                bytes_read += len(data)
-
-                start, offset, data = self.fs._read_metadata(start, offset, dir_entry.size + 1)
-                bytes_read += len(data)
-
-                yield self.fs.inode(
-                    dir_header.start_block,
-                    dir_entry.offset,
-                    data.decode(errors="surrogateescape"),
-                    dir_entry.type,
-                    dir_header.inode_number + dir_entry.inode_number,
-                    parent=self,
+        _, _, buf = self.fs._read_metadata(start, self.header.offset, self.size - 3)
+
+        unpack_header = _dir_header.unpack_from
+        unpack_entry = _dir_entry.unpack_from
+
+        pos = 0
+        end = len(buf)
+        while pos < end:
+            count, header_start_block, header_inode_number = unpack_header(buf, pos)
+            pos += _dir_header.size
+
+            for _ in range(count + 1):
+                entry_offset, entry_inode_number, entry_type, entry_size = unpack_entry(buf, pos)
+                pos += _dir_entry.size
+
+                name = buf[pos : pos + entry_size + 1]
+                pos += entry_size + 1
+
+                entries[name] = (
+                    header_start_block,
+                    entry_offset,
+                    entry_type,
+                    header_inode_number + entry_inode_number,
                 )
 
+        return entries
+
+    def listdir(self) -> dict[str, INode]:
+        return {inode.name: inode for inode in self.iterdir()}
+
+    def iterdir(self) -> Iterator[INode]:
+        for name, (block, offset, type, inode_number) in self._dirents.items():
+            yield self.fs.inode(block, offset, name, type, inode_number, parent=self)
+
     @cached_property
     def block_list(self) -> list[tuple[int | None, int]]:
         fragment = self.header.fragment
@@ -411,7 +561,7 @@ class INode:
                 self.data_offset,
                 blocks * 4,
             )
-            block_list = [(block, 1) for block in c_squashfs.uint32[blocks](data)]
+            block_list = [(block, 1) for block in _uint32_array(blocks).unpack_from(data)]
         else:
             block_list = []
 
@@ -436,8 +586,73 @@ class FileStream(RunlistStream):
         self.fragment = inode.header.fragment
         self.fragment_offset = inode.header.offset
 
+        # Cumulative compressed sizes of all preceding blocks, so the on-disk offset
+        # of any block is a single O(1) lookup instead of a sum over the runlist
+        self._cumulative_sizes = list(
+            accumulate(
+                (v & ~c_squashfs.SQUASHFS_COMPRESSED_BIT_BLOCK if v is not None else 0 for v, _ in self.runlist),
+                initial=0,
+            )
+        )
+
+        # Prefetch at most this many blocks per window, so the decompressed data of
+        # a single large read stays well under the block cache budget and can't
+        # evict its own blocks before the read loop consumes them
+        self._prefetch_window = max(1, DEFAULT_CACHE_SIZE // (4 * self.block_size))
+
+    def _prefetch(self, first_idx: int, last_idx: int) -> int:
+        """Read the compressed data of multiple consecutive blocks in one go.
+
+        Block contents are decompressed per block and stored in the filesystem block
+        cache, so the read loop that follows hits RAM instead of issuing one seek and
+        read pair per block. At most ``_prefetch_window`` blocks are handled per call;
+        the index after the last considered block is returned so callers can prefetch
+        the remainder of a large read in later windows.
+        """
+        fs = self.fs
+        mask = ~c_squashfs.SQUASHFS_COMPRESSED_BIT_BLOCK
+
+        last_idx = min(last_idx, first_idx + self._prefetch_window - 1)
+
+        pending = []
+        for idx in range(first_idx, min(last_idx + 1, len(self.runlist))):
+            value, _ = self.runlist[idx]
+            # Skip sparse (0) and fragment (None) runs, they have no data of their own
+            if not value:
+                continue
+
+            compressed = value & c_squashfs.SQUASHFS_COMPRESSED_BIT_BLOCK == 0
+            if compressed and fs._decompress is None:
+                continue
+
+            start = self.start_block + self._cumulative_sizes[idx]
+            if (start, value) not in fs._block_cache:
+                pending.append((start, value, compressed))
+
+        if len(pending) < 2:
+            return last_idx + 1
+
+        span_start = pending[0][0]
+        span_end = pending[-1][0] + (pending[-1][1] & mask)
+        buf = fs._read_raw(span_start, span_end - span_start)
+
+        def _inflate(item: tuple[int, int, bool]) -> bytes:
+            start, value, compressed = item
+            data = buf[start - span_start : start - span_start + (value & mask)]
+            if compressed:
+                data = fs._decompress(data, self.block_size)
+            return data
+
+        blocks = fs._pool.map(_inflate, pending) if fs._pool is not None else map(_inflate, pending)
+
+        for (start, value, _), data in zip(pending, blocks):
+            fs._cache_block((start, value), (start + (value & mask), data))
+
+        return last_idx + 1
+
     def _read(self, offset: int, length: int) -> bytes:
-        result = []
+        out = bytearray(length)
+        pos = 0
 
         block_offset = offset // self.block_size
 
@@ -445,20 +660,54 @@ class FileStream(RunlistStream):
         runlist_len = len(self.runlist)
         size = self.size
 
-        start_block = self.start_block + sum(
-            v & ~c_squashfs.SQUASHFS_COMPRESSED_BIT_BLOCK for v, _ in self.runlist[:run_idx]
-        )
+        last_idx = bisect_right(self._runlist_offsets, (offset + length - 1) // self.block_size)
+        prefetch_end = run_idx
+        if last_idx > run_idx:
+            prefetch_end = self._prefetch(run_idx, last_idx)
+
+        start_block = self.start_block + self._cumulative_sizes[run_idx]
+
+        # Blocks fully covered by this read are consumed whole, so handle them in a
+        # tight loop without the per-iteration position bookkeeping of the general
+        # loop below; only the first and last partial blocks need that
+        if offset % self.block_size == 0:
+            block_size = self.block_size
+            while (
+                run_idx < runlist_len
+                and length >= block_size
+                and size - offset >= block_size
+                and (run_block_size := self.runlist[run_idx][0]) is not None
+            ):
+                if prefetch_end <= run_idx < last_idx:
+                    prefetch_end = self._prefetch(run_idx, last_idx)
+
+                if run_block_size == 0:
+                    pos += block_size
+                else:
+                    start_block, data = self.fs._read_block(start_block, run_block_size)
+                    chunk = data[:block_size]
+                    out[pos : pos + len(chunk)] = chunk
+                    pos += len(chunk)
+
+                offset += block_size
+                length -= block_size
+                run_idx += 1
 
         while length > 0:
             if run_idx >= runlist_len:
                 # We somehow requested more data than we have runs for
                 break
 
+            if prefetch_end <= run_idx < last_idx:
+                prefetch_end = self._prefetch(run_idx, last_idx)
+
             run_block_size, run_block_count = self.runlist[run_idx]
 
             # For squashfs we use 0 to indicate a sparse block and None to indicate a fragment
             if run_block_size is None:
-                result.append(self.fs._read_fragment(self.fragment, self.fragment_offset, run_block_count))
+                chunk = self.fs._read_fragment(self.fragment, self.fragment_offset, run_block_count)
+                out[pos : pos + len(chunk)] = chunk
+                pos += len(chunk)
                 offset += run_block_count
                 length -= run_block_count
             else:
@@ -472,15 +721,17 @@ class FileStream(RunlistStream):
 
                 read_count = min(size - offset, min(run_remaining, length))
 
-                # Sparse run
+                # Sparse run, the preallocated buffer is already zeroed
                 if run_block_size == 0:
-                    result.append(b"\x00" * read_count)
+                    pos += read_count
                 else:
                     start_block, data = self.fs._read_block(start_block, run_block_size)
-                    result.append(data[:read_count])
+                    chunk = data[:read_count]
+                    out[pos : pos + len(chunk)] = chunk
+                    pos += len(chunk)
 
                 offset += read_count
                 length -= read_count
                 run_idx += 1
 
-        return b"".join(result)
+        return bytes(out) if pos == len(out) else bytes(out[:pos])
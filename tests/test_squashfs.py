@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from collections import Counter
+from typing import TYPE_CHECKING
+
 import pytest
 
 from dissect.squashfs.c_squashfs import c_squashfs
@@ -10,6 +13,9 @@ from dissect.squashfs.exceptions import (
 )
 from dissect.squashfs.squashfs import SquashFS
 
+if TYPE_CHECKING:
+    from typing import BinaryIO
+
 
 def _verify_filesystem(sqfs: SquashFS) -> None:
     assert sqfs.root.is_dir()
@@ -75,3 +81,34 @@ def test_squashfs(sqfs: str, compression_id: int, request: pytest.FixtureRequest
     sqfs = SquashFS(request.getfixturevalue(sqfs))
     assert sqfs.sb.compression == compression_id
     _verify_filesystem(sqfs)
+
+
+def test_squashfs_workers(gzip_sqfs: BinaryIO) -> None:
+    _verify_filesystem(SquashFS(gzip_sqfs, workers=2))
+
+
+def test_prefetch_bounded_by_cache_budget(gzip_sqfs: BinaryIO, monkeypatch: pytest.MonkeyPatch) -> None:
+    # A read larger than the block cache budget must not prefetch so far ahead
+    # that its own blocks are evicted before being consumed
+    sqfs = SquashFS(gzip_sqfs)
+    monkeypatch.setattr("dissect.squashfs.squashfs.DEFAULT_CACHE_SIZE", 16 * sqfs.block_size)
+    stream = sqfs.get("large-file").open()
+
+    seen = Counter()
+    decompress = sqfs._decompress
+
+    def counting_decompress(data: bytes, expected: int) -> bytes:
+        seen[bytes(data)] += 1
+        return decompress(data, expected)
+
+    monkeypatch.setattr(sqfs, "_decompress", counting_decompress)
+
+    assert stream.read() == b"".join([bytes([i] * 4096) for i in range(255)]) * 4
+    assert max(seen.values()) == 1
+
+
+def test_iter_inodes(gzip_sqfs: BinaryIO) -> None:
+    sqfs = SquashFS(gzip_sqfs)
+    inodes = list(sqfs.iter_inodes())
+    assert len(inodes) == sqfs.sb.inodes
+    assert sorted(inode.inode_number for inode in inodes) == list(range(1, sqfs.sb.inodes + 1))